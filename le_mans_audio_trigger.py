@@ -1,16 +1,20 @@
 import sys
 import os
+import re
 import time
+import traceback
+from collections import deque
+from contextlib import contextmanager
+from enum import IntEnum
 from pathlib import Path
 from typing import Optional
-from datetime import datetime
 
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QPushButton, QCheckBox, QSlider, QSpinBox, QFileDialog,
     QGroupBox, QFrame
 )
-from PySide6.QtCore import QThread, Signal, QTimer, Qt, QSettings
+from PySide6.QtCore import QObject, QThread, Signal, Slot, QTimer, Qt, QSettings, QEvent
 from PySide6.QtGui import QFont
 
 import pygame.mixer
@@ -22,58 +26,197 @@ except ImportError:
     IRSDK_AVAILABLE = False
     print("Warning: irsdk not available. Install with: pip install irsdk")
 
+_LEMANS_RE = re.compile(r'(le[\s\-]?mans|circuit de la sarthe|sarthe)', re.IGNORECASE)
 
-class TelemetryWorker(QThread):
+
+class SessionState(IntEnum):
+    INVALID = 0
+    GET_IN_CAR = 1
+    WARMUP = 2
+    PARADE_LAPS = 3
+    RACING = 4
+    CHECKERED = 5
+    COOL_DOWN = 6
+
+
+_PRERACE_STATES = frozenset((SessionState.GET_IN_CAR, SessionState.WARMUP))
+
+_GRID_TIMER_TRANSITIONS = {
+    (SessionState.GET_IN_CAR, SessionState.PARADE_LAPS): "Parade laps started - countdown begins",
+    (SessionState.WARMUP, SessionState.PARADE_LAPS): "Parade laps started - countdown begins",
+    (SessionState.GET_IN_CAR, SessionState.RACING): "Standing start - race begins",
+    (SessionState.WARMUP, SessionState.RACING): "Standing start - race begins",
+}
+
+_POLLER_STOP_TIMEOUT_MS = 2000
+
+_CONN_OK_QSS = "QLabel { color: green; font-weight: bold; }"
+_CONN_BAD_QSS = "QLabel { color: red; font-weight: bold; }"
+
+_STATE_COLORS = {
+    "Idle": "#666666",
+    "Armed": "#ff6600",
+    "Waiting": "#ffaa00",
+    "Triggered": "#00aa00"
+}
+_STATE_QSS = {
+    state: f"QLabel {{ font-weight: bold; color: {color}; }}"
+    for state, color in _STATE_COLORS.items()
+}
+_STATE_DEFAULT_QSS = "QLabel { font-weight: bold; color: #000000; }"
+
+_DARK_QSS = """
+QWidget {
+    background-color: #2b2b2b;
+    color: #ffffff;
+}
+QGroupBox {
+    border: 1px solid #555555;
+    border-radius: 5px;
+    margin-top: 10px;
+    padding-top: 10px;
+    font-weight: bold;
+}
+QGroupBox::title {
+    subcontrol-origin: margin;
+    left: 10px;
+    padding: 0 5px;
+}
+QPushButton {
+    background-color: #3d3d3d;
+    border: 1px solid #555555;
+    border-radius: 3px;
+    padding: 5px 15px;
+    color: #ffffff;
+}
+QPushButton:hover {
+    background-color: #4d4d4d;
+}
+QPushButton:pressed {
+    background-color: #2d2d2d;
+}
+QCheckBox {
+    spacing: 5px;
+}
+QSlider::groove:horizontal {
+    border: 1px solid #555555;
+    height: 8px;
+    background: #3d3d3d;
+    border-radius: 4px;
+}
+QSlider::handle:horizontal {
+    background: #0078d4;
+    border: 1px solid #005a9e;
+    width: 18px;
+    margin: -5px 0;
+    border-radius: 9px;
+}
+QSpinBox {
+    background-color: #3d3d3d;
+    border: 1px solid #555555;
+    border-radius: 3px;
+    padding: 3px;
+}
+QLabel {
+    background-color: transparent;
+}
+QFrame[frameShape="4"] {
+    color: #555555;
+}
+"""
+
+
+class TelemetryPoller(QObject):
     connection_changed = Signal(bool)
     session_info_updated = Signal(dict) 
     grid_timer_ended = Signal()
     status_message = Signal(str)
+    _flags_requested = Signal(bool, bool, bool)
+    _stop_requested = Signal()
     
     def __init__(self):
         super().__init__()
         self.ir = None
-        self.running = False
         self.enabled = False
+        self.trigger_primed = False
         
         self.last_session_num = -1
         self.last_session_state = -1
         self.is_connected = False
         
-        self.last_session_time = -1
         self.grid_timer_triggered = False
         
-        self.poll_interval = 0.1
-    def run(self):
-        self.running = True
+        self._debug = False
+        self._last_err = None
         
+        self._interval_idle = 1000
+        self._interval_connected = 200
+        self._interval_prerace = 20
+        
+        self._timer = None
+        self._flags_requested.connect(self._on_flags)
+        self._stop_requested.connect(self._on_stop)
+        
+        self._si_version = None
+        self._si_cache = None
+        self._wi_cache = None
+        self._session_key = None
+        self._session_cached = None
+        self._last_check_key = None
+        self._last_info_key = None
+    
+    @Slot()
+    def start(self):
         if not IRSDK_AVAILABLE:
             self.status_message.emit("ERROR: irsdk package not installed")
             return
         
         self.ir = irsdk.IRSDK()
-        self.status_message.emit("Telemetry worker started")
-        
-        while self.running:
-            if self.ir.startup():
-                if not self.is_connected:
-                    self.is_connected = True
-                    self.connection_changed.emit(True)
-                    self.status_message.emit("Connected to iRacing")
-                
-                if self.enabled:
-                    self._process_telemetry()
-            else:
-                if self.is_connected:
-                    self.is_connected = False
-                    self.connection_changed.emit(False)
-                    self.status_message.emit("Disconnected from iRacing")
-                    self._reset_state()
-            
-            time.sleep(self.poll_interval)
-        
-        if self.ir:
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._tick)
+        self.status_message.emit("Telemetry poller started")
+        self._timer.start(0)
+    
+    def _tick(self):
+        if self.is_connected and not (self.ir.is_initialized and self.ir.is_connected):
+            self.is_connected = False
             self.ir.shutdown()
-        self.status_message.emit("Telemetry worker stopped")
+            self.connection_changed.emit(False)
+            self.status_message.emit("Disconnected from iRacing")
+            self._reset_state()
+        elif not self.is_connected and self.ir.startup() and self.ir.is_initialized and self.ir.is_connected:
+            self.is_connected = True
+            self.connection_changed.emit(True)
+            self.status_message.emit("Connected to iRacing")
+        
+        if self.is_connected and self.enabled:
+            self._process_telemetry()
+        
+        self._timer.setInterval(self._next_interval())
+    
+    def _next_interval(self):
+        if not self.is_connected:
+            return self._interval_idle
+        if self.trigger_primed and self.last_session_state in _PRERACE_STATES:
+            return self._interval_prerace
+        return self._interval_connected
+    
+    def set_flags(self, enabled, trigger_primed, reset_trigger=False):
+        self._flags_requested.emit(enabled, trigger_primed, reset_trigger)
+    
+    @Slot(bool, bool, bool)
+    def _on_flags(self, enabled, trigger_primed, reset_trigger):
+        if reset_trigger:
+            self.grid_timer_triggered = False
+        
+        if enabled == self.enabled and trigger_primed == self.trigger_primed:
+            return
+        self.enabled = enabled
+        self.trigger_primed = trigger_primed
+        
+        if self._timer is not None and self._timer.isActive():
+            self._timer.start(0)
     
     def _process_telemetry(self):
         if not self.ir.is_initialized:
@@ -83,17 +226,13 @@ class TelemetryWorker(QThread):
             return
         
         try:
-            self.ir.freeze_var_buffer_latest()
-        except Exception as e:
+            with self._frozen():
+                session_num = self.ir['SessionNum']
+                session_state = self.ir['SessionState']
+                self._check_session_change(session_num, session_state)
+        except Exception:
             return
         
-        session_num = self.ir['SessionNum']
-        session_state = self.ir['SessionState']
-        
-        self.ir.unfreeze_var_buffer_latest()
-        
-        self._check_session_change()
-        
         if session_num is not None and session_num != self.last_session_num:
             if self.last_session_num != -1:
                 self.status_message.emit(f"Session changed (Num: {session_num})")
@@ -102,38 +241,53 @@ class TelemetryWorker(QThread):
             self.last_session_num = session_num
         
         if session_state is not None and session_state != self.last_session_state:
-            if not self.grid_timer_triggered:
+            if self.trigger_primed and not self.grid_timer_triggered:
                 self._detect_grid_timer_end(session_state)
+            else:
+                self.last_session_state = session_state
     
-    def _check_session_change(self):
+    @contextmanager
+    def _frozen(self):
+        self.ir.freeze_var_buffer_latest()
         try:
-            weekend_info = self.ir['WeekendInfo']
-            
-            if not weekend_info:
+            yield
+        finally:
+            self.ir.unfreeze_var_buffer_latest()
+    
+    def _check_session_change(self, session_num, session_state):
+        try:
+            if session_num is None:
                 return
             
-            track_name = weekend_info.get('TrackDisplayName', 'Unknown')
-            
-            session_info = self.ir['SessionInfo']
+            if session_state is None:
+                session_state = 0
             
-            if not session_info:
+            ver = getattr(self.ir, 'session_info_update', None)
+            check_key = (ver, session_num, session_state)
+            if ver is not None and check_key == self._last_check_key:
                 return
             
-            session_num = self.ir['SessionNum']
-            if session_num is None:
-                return
+            if ver is None or ver != self._si_version or not self._si_cache:
+                weekend_info = self.ir['WeekendInfo']
+                session_info = self.ir['SessionInfo']
+                if not weekend_info or not session_info:
+                    return
+                
+                self._wi_cache = weekend_info
+                self._si_cache = session_info
+                self._si_version = ver
+                self._session_key = None
+            
+            weekend_info = self._wi_cache
+            track_name = weekend_info.get('TrackDisplayName', 'Unknown')
             
-            sessions = session_info.get('Sessions', [])
+            self._last_check_key = check_key
             
+            current_session = self._current_session(session_num)
             session_type = 'Unknown'
-            if sessions and 0 <= session_num < len(sessions):
-                current_session = sessions[session_num]
+            if current_session:
                 session_type = current_session.get('SessionType', 'Unknown')
             
-            session_state = self.ir['SessionState']
-            if session_state is None:
-                session_state = 0
-            
             info = {
                 'track': track_name,
                 'track_short': weekend_info.get('TrackDisplayShortName', 'Unknown'),
@@ -141,19 +295,40 @@ class TelemetryWorker(QThread):
                 'session_num': session_num,
                 'session_state': session_state
             }
+            info_key = (track_name, session_type, session_num, session_state)
+            if info_key == self._last_info_key:
+                return
+            self._last_info_key = info_key
+            self._last_err = None
             self.session_info_updated.emit(info)
             
         except Exception as e:
-            import traceback
-            self.status_message.emit(f"ERROR: {e}\n{traceback.format_exc()}")
+            msg = traceback.format_exc() if self._debug else f"{type(e).__name__}: {e}"
+            if msg != self._last_err:
+                self._last_err = msg
+                self.status_message.emit(f"ERROR: {msg}")
+    
+    def _current_session(self, session_num):
+        key = (self._si_version, session_num)
+        if key == self._session_key:
+            return self._session_cached
+        
+        sessions = self._si_cache.get('Sessions', [])
+        current_session = None
+        if sessions and 0 <= session_num < len(sessions):
+            current_session = sessions[session_num]
+        
+        self._session_key = key
+        self._session_cached = current_session
+        return current_session
     
     def _detect_grid_timer_end(self, session_state):
-        if session_state == 3 and self.last_session_state in [1, 2]:
-            self.status_message.emit("Parade laps started - countdown begins")
-            self.grid_timer_ended.emit()
-            self.grid_timer_triggered = True
-        elif session_state == 4 and self.last_session_state in [1, 2]:
-            self.status_message.emit("Standing start - race begins")
+        if session_state == self.last_session_state:
+            return
+        
+        msg = _GRID_TIMER_TRANSITIONS.get((self.last_session_state, session_state))
+        if msg:
+            self.status_message.emit(msg)
             self.grid_timer_ended.emit()
             self.grid_timer_triggered = True
         
@@ -161,59 +336,79 @@ class TelemetryWorker(QThread):
     
     def _reset_trigger_state(self):
         self.grid_timer_triggered = False
-        self.last_session_time = -1
     
     def _reset_state(self):
+        self._si_version = None
+        self._si_cache = None
+        self._wi_cache = None
+        self._session_key = None
+        self._session_cached = None
+        self._last_check_key = None
+        self._last_info_key = None
+        self._last_err = None
         self.last_session_num = -1
         self.last_session_state = -1
         self._reset_trigger_state()
     
     def stop(self):
-        self.running = False
-        self.wait()
+        self._stop_requested.emit()
+    
+    @Slot()
+    def _on_stop(self):
+        if self._timer is not None and self._timer.isActive():
+            self._timer.stop()
+            self.ir.shutdown()
+            self.status_message.emit("Telemetry poller stopped")
+        self.thread().quit()
 
 
 class AudioManager:
+    __slots__ = ('_channel', '_sound', 'audio_file', 'error', 'volume')
     
     def __init__(self):
+        # These are pygame 2's defaults; pinned so the 512-sample buffer does
+        # not silently change with the installed pygame version.
+        pygame.mixer.pre_init(44100, -16, 2, 512)
         pygame.mixer.init()
+        pygame.mixer.set_reserved(1)
+        self._channel = pygame.mixer.Channel(0)
+        self._sound = None
         self.audio_file = None
+        self.error: Optional[str] = None
         self.volume = 0.7
-        pygame.mixer.music.set_volume(self.volume)
+        self._channel.set_volume(self.volume)
     
     def set_audio_file(self, filepath: str) -> bool:
+        self.error = None
         try:
-            if not os.path.exists(filepath):
-                return False
-            
-            pygame.mixer.music.load(filepath)
+            self._sound = pygame.mixer.Sound(filepath)
             self.audio_file = filepath
             return True
         except Exception as e:
-            print(f"Error loading audio file: {e}")
+            self.error = str(e)
             return False
     
     def set_volume(self, volume: float):
         self.volume = max(0.0, min(1.0, volume))
-        pygame.mixer.music.set_volume(self.volume)
+        self._channel.set_volume(self.volume)
     
     def play(self):
-        if self.audio_file and os.path.exists(self.audio_file):
+        self.error = None
+        if self._sound:
             try:
-                pygame.mixer.music.load(self.audio_file)
-                pygame.mixer.music.set_volume(self.volume)
-                pygame.mixer.music.play(loops=0)
+                self._channel.set_volume(self.volume)
+                self._channel.play(self._sound)
                 return True
             except Exception as e:
-                print(f"Error playing audio: {e}")
+                self.error = str(e)
                 return False
         return False
     
     def stop(self):
-        pygame.mixer.music.stop()
+        self._channel.stop()
     
     def is_playing(self) -> bool:
-        return pygame.mixer.music.get_busy()
+        return self._channel.get_busy()
 
 
 class MainWindow(QMainWindow):
@@ -224,27 +419,45 @@ class MainWindow(QMainWindow):
         
         self.audio_manager = AudioManager()
         
-        self.telemetry_worker = TelemetryWorker()
-        self.telemetry_worker.connection_changed.connect(self.on_connection_changed)
-        self.telemetry_worker.session_info_updated.connect(self.on_session_info_updated)
-        self.telemetry_worker.grid_timer_ended.connect(self.on_grid_timer_ended)
-        self.telemetry_worker.status_message.connect(self.on_status_message)
+        self.telemetry_thread = QThread(self)
+        self.telemetry_poller = TelemetryPoller()
+        self.telemetry_poller.moveToThread(self.telemetry_thread)
+        self.telemetry_thread.started.connect(self.telemetry_poller.start)
+        self.telemetry_thread.finished.connect(self.telemetry_poller.deleteLater)
+        self.telemetry_poller.connection_changed.connect(self.on_connection_changed)
+        self.telemetry_poller.session_info_updated.connect(self.on_session_info_updated)
+        self.telemetry_poller.grid_timer_ended.connect(self.on_grid_timer_ended)
+        self.telemetry_poller.status_message.connect(self.on_status_message)
         
         self.is_armed = False
         self.current_track = "Unknown"
         self.current_session_type = "Unknown"
+        self._is_race = False
         self.is_le_mans = False
+        self._last_track = None
         self.trigger_state = "Idle"
+        self._last_conn_qss = _CONN_BAD_QSS
+        
+        self._ts_sec = -1
+        self._ts_str = ''
+        self._log_ring = deque(maxlen=200)
         
         self.delay_timer = QTimer()
         self.delay_timer.setSingleShot(True)
         self.delay_timer.timeout.connect(self.on_delay_timeout)
         
+        self._persisted_settings = {}
+        self._pending_settings = {}
+        self._persist_timer = QTimer(self)
+        self._persist_timer.setSingleShot(True)
+        self._persist_timer.setInterval(500)
+        self._persist_timer.timeout.connect(self._flush_settings)
+        
         self.init_ui()
         
         self.load_settings()
         
-        self.telemetry_worker.start()
+        self.telemetry_thread.start()
     
     def init_ui(self):
         self.setWindowTitle("iRacing Le Mans Audio Trigger")
@@ -327,7 +540,7 @@ class MainWindow(QMainWindow):
         connection_layout = QHBoxLayout()
         connection_layout.addWidget(QLabel("iRacing:"))
         self.connection_label = QLabel("Disconnected")
-        self.connection_label.setStyleSheet("QLabel { color: red; font-weight: bold; }")
+        self.connection_label.setStyleSheet(self._last_conn_qss)
         connection_layout.addWidget(self.connection_label)
         connection_layout.addStretch()
         status_layout.addLayout(connection_layout)
@@ -348,8 +561,8 @@ class MainWindow(QMainWindow):
         
         state_layout = QHBoxLayout()
         state_layout.addWidget(QLabel("Trigger State:"))
-        self.state_label = QLabel("Idle")
-        self.state_label.setStyleSheet("QLabel { font-weight: bold; }")
+        self.state_label = QLabel(self.trigger_state)
+        self.state_label.setStyleSheet(_STATE_QSS[self.trigger_state])
         state_layout.addWidget(self.state_label)
         state_layout.addStretch()
         status_layout.addLayout(state_layout)
@@ -371,10 +584,10 @@ class MainWindow(QMainWindow):
     
     def on_enable_changed(self, state):
         enabled = (state == 2)
-        self.telemetry_worker.enabled = enabled
+        self._push_poller_flags(reset_trigger=enabled)
+        self._queue_setting('enabled', enabled)
         
         if enabled:
-            self.telemetry_worker.grid_timer_triggered = False
             self.on_status_message("Trigger enabled - monitoring for race sessions")
             self.update_trigger_state()
         else:
@@ -394,22 +607,24 @@ class MainWindow(QMainWindow):
             if self.audio_manager.set_audio_file(file_path):
                 self.file_label.setText(Path(file_path).name)
                 self.file_label.setToolTip(file_path)
+                self._queue_setting('audio_file', file_path)
                 self.on_status_message(f"Loaded audio file: {Path(file_path).name}")
             else:
-                self.on_status_message(f"ERROR: Failed to load audio file")
+                self.on_status_message(f"ERROR: Failed to load audio file: {self.audio_manager.error}")
     
     def on_volume_changed(self, value):
         self.volume_label.setText(f"{value}%")
         self.audio_manager.set_volume(value / 100.0)
+        self._queue_setting('volume', value)
     
     def on_delay_changed(self, value):
-        pass
+        self._queue_setting('delay', value)
     
     def test_play(self):
         if self.audio_manager.play():
             self.on_status_message("Test playback started")
         else:
-            self.on_status_message("ERROR: No audio file selected or playback failed")
+            self.on_status_message(f"ERROR: {self.audio_manager.error or 'No audio file selected'}")
     
     def test_stop(self):
         self.audio_manager.stop()
@@ -418,25 +633,33 @@ class MainWindow(QMainWindow):
     def on_connection_changed(self, connected):
         if connected:
             self.connection_label.setText("Connected")
-            self.connection_label.setStyleSheet("QLabel { color: green; font-weight: bold; }")
+            self._set_connection_qss(_CONN_OK_QSS)
         else:
             self.connection_label.setText("Disconnected")
-            self.connection_label.setStyleSheet("QLabel { color: red; font-weight: bold; }")
+            self._set_connection_qss(_CONN_BAD_QSS)
             self.track_label.setText("Unknown")
             self.session_label.setText("Unknown")
             self.set_trigger_state("Idle")
             self.delay_timer.stop()
     
+    def _set_connection_qss(self, qss):
+        if qss != self._last_conn_qss:
+            self._last_conn_qss = qss
+            self.connection_label.setStyleSheet(qss)
+    
     def on_session_info_updated(self, info):
         self.current_track = info['track']
         self.current_session_type = info['session_type']
+        self._is_race = (self.current_session_type.lower() == 'race')
         
-        self.track_label.setText(self.current_track)
-        self.session_label.setText(self.current_session_type)
+        if self.track_label.text() != self.current_track:
+            self.track_label.setText(self.current_track)
+        if self.session_label.text() != self.current_session_type:
+            self.session_label.setText(self.current_session_type)
         
-        track_lower = self.current_track.lower()
-        self.is_le_mans = ('le mans' in track_lower or 'lemans' in track_lower or 
-                          'circuit de la sarthe' in track_lower or 'sarthe' in track_lower)
+        if self.current_track != self._last_track:
+            self._last_track = self.current_track
+            self.is_le_mans = bool(_LEMANS_RE.search(self.current_track))
         
         self.update_trigger_state()
     
@@ -464,65 +687,114 @@ class MainWindow(QMainWindow):
             self.set_trigger_state("Triggered")
             self.on_status_message("Audio playback started successfully")
         else:
-            self.on_status_message("ERROR: Failed to play audio - check file selection")
+            self.on_status_message(f"ERROR: {self.audio_manager.error or 'Failed to play audio - check file selection'}")
             self.set_trigger_state("Armed")
     
     def update_trigger_state(self):
         if not self.enable_checkbox.isChecked():
             return
         
-        is_race = (self.current_session_type.lower() == 'race')
-        
-        if is_race and self.trigger_state in ["Idle", "Triggered"]:
+        if self._is_race and self.trigger_state in ["Idle", "Triggered"]:
             self.set_trigger_state("Armed")
             self.on_status_message(f"Trigger armed - {self.current_track} race detected")
-        elif not is_race and self.trigger_state in ["Armed", "Waiting"]:
+        elif not self._is_race and self.trigger_state in ["Armed", "Waiting"]:
             self.set_trigger_state("Idle")
             self.delay_timer.stop()
     
     def set_trigger_state(self, state):
+        if state == self.trigger_state:
+            return
         self.trigger_state = state
-        self.state_label.setText(state)
+        self._push_poller_flags()
         
-        colors = {
-            "Idle": "#666666",
-            "Armed": "#ff6600",
-            "Waiting": "#ffaa00",
-            "Triggered": "#00aa00"
-        }
-        color = colors.get(state, "#000000")
-        self.state_label.setStyleSheet(f"QLabel {{ font-weight: bold; color: {color}; }}")
+        self.state_label.setText(state)
+        self.state_label.setStyleSheet(_STATE_QSS.get(state, _STATE_DEFAULT_QSS))
+    
+    def _push_poller_flags(self, reset_trigger=False):
+        self.telemetry_poller.set_flags(
+            self.enable_checkbox.isChecked(),
+            self.trigger_state == "Armed",
+            reset_trigger
+        )
     
     def on_status_message(self, message):
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.status_text.setText(f"[{timestamp}] {message}")
+        now = int(time.time())
+        if now != self._ts_sec:
+            self._ts_sec = now
+            lt = time.localtime(now)
+            self._ts_str = f"{lt.tm_hour:02d}:{lt.tm_min:02d}:{lt.tm_sec:02d}"
+        self._log_ring.append(f"[{self._ts_str}] {message}")
+        if self.isVisible() and not self.isMinimized():
+            self.status_text.setText(self._log_ring[-1])
+    
+    def _flush_status(self):
+        if self._log_ring and self.status_text.text() != self._log_ring[-1]:
+            self.status_text.setText(self._log_ring[-1])
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._flush_status()
+    
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange and not self.isMinimized():
+            self._flush_status()
     
     def load_settings(self):
         audio_file = self.settings.value('audio_file', '')
+        volume = self.settings.value('volume', 70, type=int)
+        delay = self.settings.value('delay', 38, type=int)
+        enabled = self.settings.value('enabled', False, type=bool)
+        self._persisted_settings = {
+            'audio_file': audio_file,
+            'volume': volume,
+            'delay': delay,
+            'enabled': enabled
+        }
+        
         if audio_file and os.path.exists(audio_file):
             if self.audio_manager.set_audio_file(audio_file):
                 self.file_label.setText(Path(audio_file).name)
                 self.file_label.setToolTip(audio_file)
         
-        volume = self.settings.value('volume', 70, type=int)
         self.volume_slider.setValue(volume)
         
-        delay = self.settings.value('delay', 38, type=int)
         self.delay_spinbox.setValue(delay)
         
-        enabled = self.settings.value('enabled', False, type=bool)
         self.enable_checkbox.setChecked(enabled)
-        self.telemetry_worker.enabled = enabled
+    
+    def _queue_setting(self, key, value):
+        if key not in self._pending_settings and self._persisted_settings.get(key) == value:
+            return
+        self._pending_settings[key] = value
+        self._persist_timer.start()
+    
+    def _flush_settings(self):
+        self._persist_timer.stop()
+        if not self._pending_settings:
+            return
+        for key, value in self._pending_settings.items():
+            if self._persisted_settings.get(key) != value:
+                self.settings.setValue(key, value)
+                self._persisted_settings[key] = value
+        self._pending_settings.clear()
+        self.settings.sync()
     
     def save_settings(self):
-        self.settings.setValue('audio_file', self.audio_manager.audio_file or '')
-        self.settings.setValue('volume', self.volume_slider.value())
-        self.settings.setValue('delay', self.delay_spinbox.value())
-        self.settings.setValue('enabled', self.enable_checkbox.isChecked())
+        self._queue_setting('audio_file', self.audio_manager.audio_file or '')
+        self._queue_setting('volume', self.volume_slider.value())
+        self._queue_setting('delay', self.delay_spinbox.value())
+        self._queue_setting('enabled', self.enable_checkbox.isChecked())
+        self._flush_settings()
     
     def closeEvent(self, event):
         self.save_settings()
-        self.telemetry_worker.stop()
+        self.telemetry_poller.stop()
+        if not self.telemetry_thread.wait(_POLLER_STOP_TIMEOUT_MS):
+            # The poller is stuck inside a blocking irsdk call (startup() has
+            # no timeout); we are exiting anyway, so don't hang the window.
+            self.telemetry_thread.terminate()
+            self.telemetry_thread.wait()
         self.audio_manager.stop()
         event.accept()
 
@@ -535,66 +807,7 @@ def main():
     app.setOrganizationDomain("github.com")
     
     app.setStyle("Fusion")
-    dark_palette = """
-    QWidget {
-        background-color: #2b2b2b;
-        color: #ffffff;
-    }
-    QGroupBox {
-        border: 1px solid #555555;
-        border-radius: 5px;
-        margin-top: 10px;
-        padding-top: 10px;
-        font-weight: bold;
-    }
-    QGroupBox::title {
-        subcontrol-origin: margin;
-        left: 10px;
-        padding: 0 5px;
-    }
-    QPushButton {
-        background-color: #3d3d3d;
-        border: 1px solid #555555;
-        border-radius: 3px;
-        padding: 5px 15px;
-        color: #ffffff;
-    }
-    QPushButton:hover {
-        background-color: #4d4d4d;
-    }
-    QPushButton:pressed {
-        background-color: #2d2d2d;
-    }
-    QCheckBox {
-        spacing: 5px;
-    }
-    QSlider::groove:horizontal {
-        border: 1px solid #555555;
-        height: 8px;
-        background: #3d3d3d;
-        border-radius: 4px;
-    }
-    QSlider::handle:horizontal {
-        background: #0078d4;
-        border: 1px solid #005a9e;
-        width: 18px;
-        margin: -5px 0;
-        border-radius: 9px;
-    }
-    QSpinBox {
-        background-color: #3d3d3d;
-        border: 1px solid #555555;
-        border-radius: 3px;
-        padding: 3px;
-    }
-    QLabel {
-        background-color: transparent;
-    }
-    QFrame[frameShape="4"] {
-        color: #555555;
-    }
-    """
-    app.setStyleSheet(dark_palette)
+    app.setStyleSheet(_DARK_QSS)
     
     window = MainWindow()
     window.show()